@@ -1,13 +1,13 @@
+import uuid
 from datetime import datetime, timedelta, timezone
 
 from fastapi.testclient import TestClient
 
-from main import DB_PATH, app
+from main import DB_PATH, TaskState, app, bulk_insert_tasks, connect, format_kst, to_epoch_us
 
 
 def iso(dt: datetime) -> str:
-    kst = timezone(timedelta(hours=9))
-    return dt.astimezone(kst).isoformat()
+    return format_kst(dt)
 
 
 def run() -> None:
@@ -39,13 +39,42 @@ def run() -> None:
         resp.raise_for_status()
         expired_id = resp.json()["id"]
 
+        seed_due = to_epoch_us(datetime.now(tz=timezone.utc) + timedelta(days=1))
+        seed_rows = [
+            (
+                uuid.uuid4().bytes,
+                f"Math workbook {n}",
+                "Upload photo",
+                seed_due + n * 3_600_000_000,
+                TaskState.APPROVED.value,
+            )
+            for n in range(1, 4)
+        ]
+        conn = connect()
+        try:
+            bulk_insert_tasks(conn, seed_rows)
+        finally:
+            conn.close()
+        seeded_ids = {str(uuid.UUID(bytes=row[0])) for row in seed_rows}
+
         resp = client.get("/v1/tasks")
         resp.raise_for_status()
         items = resp.json()["items"]
-        assert len(items) == 2
+        assert len(items) == 2 + len(seed_rows)
         states = {item["id"]: item["state"] for item in items}
         assert states[expired_id] == "EXPIRED"
 
+        resp = client.get("/v1/tasks", params={"state": "APPROVED"})
+        resp.raise_for_status()
+        assert {item["id"] for item in resp.json()["items"]} == seeded_ids
+
+        # "Chem" goes through the tasks_fts trigram index, "Ch" is too short
+        # for it and falls back to a plain LIKE scan.
+        for q in ("Chem", "Ch"):
+            resp = client.get("/v1/tasks", params={"q": q})
+            resp.raise_for_status()
+            assert [item["id"] for item in resp.json()["items"]] == [expired_id]
+
         resp = client.post(
             f"/v1/tasks/{created['id']}/verify-attempt",
             json={
@@ -0,0 +1,55 @@
+"""Row -> JSON dict conversion for the task list.
+
+This is the tight per-row loop of ``GET /v1/tasks``. It is kept free of
+FastAPI/pydantic imports so it can be compiled with mypyc::
+
+    pip install mypy && mypyc formatters.py
+
+The build drops a ``formatters.*.so`` next to this file, which Python imports
+ahead of the source; without it the pure-Python module is used unchanged.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Iterable
+
+# KST wall-clock time at the Unix epoch; adding an offset gives local fields
+# directly, without a tz-aware astimezone() round trip.
+KST_WALL_EPOCH = datetime(1970, 1, 1, 9)
+
+
+def id_to_str(task_id: bytes) -> str:
+    return str(uuid.UUID(bytes=task_id))
+
+
+def format_kst_wall(dt: datetime) -> str:
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.{dt.microsecond:06d}+09:00"
+    )
+
+
+# The same due dates are formatted on every list call, so repeat lookups are
+# served from the cache; the mapping never changes, so no invalidation needed.
+@lru_cache(maxsize=4096)
+def iso_from_epoch_us(us: int) -> str:
+    return format_kst_wall(KST_WALL_EPOCH + timedelta(microseconds=us))
+
+
+def rows_to_items(rows: Iterable[sqlite3.Row]) -> list[dict[str, Any]]:
+    fmt = iso_from_epoch_us
+    fmt_id = id_to_str
+    return [
+        {
+            "id": fmt_id(row["id"]),
+            "title": row["title"],
+            "verify_method": row["verify_method"],
+            "due_at_iso": fmt(row["due_at"]),
+            "state": row["state"],
+        }
+        for row in rows
+    ]
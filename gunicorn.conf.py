@@ -0,0 +1,14 @@
+"""Gunicorn settings for production: ``gunicorn -c gunicorn.conf.py main:app``.
+
+The app is preloaded in the master so workers share its imported modules
+copy-on-write. Each worker opens its own SQLite connection pool in the
+FastAPI startup hook, which runs after the fork.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
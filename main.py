@@ -1,33 +1,146 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import itertools
 import json
+import os
 import sqlite3
+import threading
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Iterable, List, Optional
+from typing import Annotated, Any, AsyncIterator, Callable, Iterable, List, Optional, TypeVar
 
+import orjson
 from fastapi import Depends, FastAPI, HTTPException, Query, status
-from pydantic import BaseModel, validator
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, StringConstraints
+
+from formatters import format_kst_wall, id_to_str, iso_from_epoch_us, rows_to_items
 
 
 DB_PATH = Path("study_assistant.db")
 SCHEMA_PATH = Path("schema.sql")
 KST = timezone(timedelta(hours=9))
-
-
-def get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+POOL_SIZE = 4
+EXPIRY_SWEEP_INTERVAL_SECONDS = 60
+TRIGRAM_LENGTH = 3
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+# sqlite3 keeps compiled statements in a per-connection LRU keyed by SQL text,
+# so every hot-path query below is a fixed module-level string.
+STATEMENT_CACHE_SIZE = 128
+
+SQL_INSERT_TASK = """
+INSERT INTO tasks (id, title, verify_method, due_at, state)
+VALUES (?, ?, ?, ?, ?)
+"""
+SQL_UPDATE_EXPIRE = """
+UPDATE tasks
+SET state = ?,
+    updated_at = CURRENT_TIMESTAMP
+WHERE state = ?
+  AND due_at <= ?
+"""
+# Overdue PENDING rows read as EXPIRED without waiting for the background
+# sweep to rewrite them, so the read path never has to write.
+SQL_EFFECTIVE_STATE = "CASE WHEN state = :pending AND due_at <= :now THEN :expired ELSE state END"
+SQL_SELECT_TASK_BY_ID = f"SELECT id, {SQL_EFFECTIVE_STATE} AS state FROM tasks WHERE id = :id"
+SQL_APPROVE_TASK = """
+UPDATE tasks
+SET state = ?, updated_at = CURRENT_TIMESTAMP
+WHERE id = ?
+RETURNING state
+"""
+SQL_INSERT_ATTEMPT = """
+INSERT INTO verification_attempts (
+    id,
+    task_id,
+    proof_url,
+    verdict,
+    score,
+    reasons,
+    raw_features
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Checked out and returned on the event loop; created per worker in on_startup.
+_pool: Optional[asyncio.Queue[sqlite3.Connection]] = None
+# SQLite allows a single writer at a time; serialize writes in-process instead
+# of letting pooled connections spin on SQLITE_BUSY.
+_write_lock = threading.Lock()
+
+
+def connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    # executescript() bypasses the statement cache, so these one-shot pragmas
+    # do not sit in it for the life of the pooled connection.
+    conn.executescript(";".join(PRAGMAS))
     return conn
 
 
+T = TypeVar("T")
+
+
+def open_pool() -> None:
+    global _pool
+    _pool = asyncio.Queue(maxsize=POOL_SIZE)
+    for _ in range(POOL_SIZE):
+        _pool.put_nowait(connect())
+
+
+def close_pool() -> None:
+    global _pool
+    if _pool is None:
+        return
+    while not _pool.empty():
+        _pool.get_nowait().close()
+    _pool = None
+
+
+async def get_db() -> AsyncIterator[sqlite3.Connection]:
+    assert _pool is not None, "connection pool is opened in on_startup"
+    conn = await _pool.get()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        _pool.put_nowait(conn)
+
+
+async def run_db(func: Callable[..., T], *args: Any) -> T:
+    """Run blocking sqlite work in a thread; on cancellation, wait for it to finish.
+
+    The worker thread cannot be interrupted, so the caller must not return its
+    connection to the pool until the thread is done with it.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            with contextlib.suppress(asyncio.CancelledError):
+                await asyncio.wait({future})
+        raise
+
+
 def init_db() -> None:
     if not SCHEMA_PATH.exists():
         raise RuntimeError("schema.sql not found. Cannot initialize database.")
 
-    conn = get_db()
+    conn = connect()
     try:
         conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
         conn.commit()
@@ -41,47 +154,78 @@ class TaskState(str, Enum):
     EXPIRED = "EXPIRED"
 
 
+_STATE_PENDING = TaskState.PENDING.value
+_STATE_APPROVED = TaskState.APPROVED.value
+_STATE_EXPIRED = TaskState.EXPIRED.value
+
+
 def ensure_kst(dt: datetime) -> datetime:
     if dt.tzinfo is None:
         return dt.replace(tzinfo=KST)
     return dt.astimezone(KST)
 
 
-class CreateTaskRequest(BaseModel):
-    title: str
-    verify_method: str
-    due_at_iso: datetime
+def to_epoch_us(dt: datetime) -> int:
+    return (ensure_kst(dt) - EPOCH) // ONE_MICROSECOND
+
+
+UUID_BATCH_SIZE = 1024
+_uuid_pool: deque[bytes] = deque()
+# A forked worker must never hand out ids drawn by its parent.
+os.register_at_fork(after_in_child=_uuid_pool.clear)
+
+
+def _refill_uuids(n: int = UUID_BATCH_SIZE) -> None:
+    buf = bytearray(os.urandom(16 * n))
+    for i in range(0, 16 * n, 16):
+        buf[i + 6] = (buf[i + 6] & 0x0F) | 0x40  # version 4
+        buf[i + 8] = (buf[i + 8] & 0x3F) | 0x80  # RFC 4122 variant
+    _uuid_pool.extend(bytes(buf[i : i + 16]) for i in range(0, 16 * n, 16))
+
+
+def new_id() -> bytes:
+    """Return the 16 bytes of a random (version 4) UUID from a pre-drawn batch."""
+    while True:
+        try:
+            return _uuid_pool.popleft()
+        except IndexError:
+            _refill_uuids()
+
+
+def id_from_str(task_id: str) -> Optional[bytes]:
+    try:
+        return uuid.UUID(task_id).bytes
+    except ValueError:
+        return None
+
 
-    @validator("title")
-    def title_not_empty(cls, value: str) -> str:
-        if not value.strip():
-            raise ValueError("title cannot be empty")
-        return value
+def format_kst(dt: datetime) -> str:
+    if dt.tzinfo is not KST:
+        dt = ensure_kst(dt)
+    return format_kst_wall(dt)
 
-    @validator("verify_method")
-    def verify_not_empty(cls, value: str) -> str:
-        if not value.strip():
-            raise ValueError("verify_method cannot be empty")
-        return value
 
-    @validator("due_at_iso")
-    def ensure_timezone(cls, value: datetime) -> datetime:
-        return ensure_kst(value)
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+
+class CreateTaskRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    title: NonEmptyStr
+    verify_method: NonEmptyStr
+    # Naive values are read as KST when converted to epoch microseconds.
+    due_at_iso: datetime
 
 
 class VerificationAttemptRequest(BaseModel):
-    proof_url: str
+    model_config = ConfigDict(frozen=True)
+
+    proof_url: NonEmptyStr
     verdict: bool
     score: Optional[float] = None
     reasons: Optional[str] = None
     raw_features: Optional[dict[str, Any]] = None
 
-    @validator("proof_url")
-    def proof_url_not_empty(cls, value: str) -> str:
-        if not value.strip():
-            raise ValueError("proof_url cannot be empty")
-        return value
-
 
 class TaskResponse(BaseModel):
     id: str
@@ -103,27 +247,87 @@ class VerifyAttemptResponse(BaseModel):
 app = FastAPI(
     title="Study Assistant Tasks API",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 
+_sweeper: Optional[asyncio.Task[None]] = None
+
+
 @app.on_event("startup")
-def on_startup() -> None:
+async def on_startup() -> None:
+    global _sweeper
     init_db()
+    open_pool()
+    _sweeper = asyncio.create_task(sweep_expired_tasks())
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    if _sweeper is not None:
+        _sweeper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _sweeper
+    close_pool()
+
+
+async def sweep_expired_tasks() -> None:
+    while True:
+        await asyncio.sleep(EXPIRY_SWEEP_INTERVAL_SECONDS)
+        await run_expiry_sweep()
+
+
+async def run_expiry_sweep() -> None:
+    async with contextlib.asynccontextmanager(get_db)() as conn:
+        await run_db(expire_overdue_tasks, conn)
 
 
 def expire_overdue_tasks(conn: sqlite3.Connection) -> None:
-    now = ensure_kst(datetime.now(tz=KST))
-    conn.execute(
-        """
-        UPDATE tasks
-        SET state = ?,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE state = ?
-          AND due_at <= ?
-        """,
-        (TaskState.EXPIRED, TaskState.PENDING, now.isoformat()),
-    )
-    conn.commit()
+    with _write_lock:
+        conn.execute(SQL_UPDATE_EXPIRE, (_STATE_EXPIRED, _STATE_PENDING, time.time_ns() // 1000))
+        conn.commit()
+
+
+def effective_state_params() -> dict[str, Any]:
+    return {"pending": _STATE_PENDING, "expired": _STATE_EXPIRED, "now": time.time_ns() // 1000}
+
+
+def title_filter_mode(q: Optional[str]) -> Optional[str]:
+    if not q:
+        return None
+    # The trigram index cannot answer patterns without a 3-character literal
+    # run (and misses some shorter non-ASCII matches), so those scan instead.
+    if len(q) >= TRIGRAM_LENGTH and "%" not in q and "_" not in q:
+        return "fts"
+    return "like"
+
+
+def build_fetch_tasks_sql(state: bool, q: Optional[str], due_before: bool, due_after: bool) -> str:
+    query = [f"SELECT id, title, verify_method, due_at, {SQL_EFFECTIVE_STATE} AS state FROM tasks WHERE 1=1"]
+
+    if state:
+        query.append(f"AND {SQL_EFFECTIVE_STATE} = :state")
+
+    if q == "fts":
+        query.append("AND id IN (SELECT id FROM tasks_fts WHERE tasks_fts.title LIKE :q)")
+    elif q == "like":
+        query.append("AND title LIKE :q")
+
+    if due_before:
+        query.append("AND due_at < :due_before")
+
+    if due_after:
+        query.append("AND due_at > :due_after")
+
+    query.append("ORDER BY due_at ASC")
+    return "\n".join(query)
+
+
+# One fixed statement per filter combination keeps list queries in the cache.
+SQL_FETCH_TASKS = {
+    flags: build_fetch_tasks_sql(*flags)
+    for flags in itertools.product((False, True), (None, "like", "fts"), (False, True), (False, True))
+}
 
 
 def fetch_tasks(
@@ -133,124 +337,151 @@ def fetch_tasks(
     due_before: Optional[datetime],
     due_after: Optional[datetime],
 ) -> Iterable[sqlite3.Row]:
-    query = ["SELECT id, title, verify_method, due_at, state FROM tasks WHERE 1=1"]
-    params: List[Any] = []
+    params = effective_state_params()
 
     if state:
-        query.append("AND state = ?")
-        params.append(state.value)
+        params["state"] = state.value
 
     if q:
-        query.append("AND title LIKE ?")
-        params.append(f"%{q}%")
+        params["q"] = f"%{q}%"
 
     if due_before:
-        query.append("AND due_at < ?")
-        params.append(ensure_kst(due_before).isoformat())
+        params["due_before"] = to_epoch_us(due_before)
 
     if due_after:
-        query.append("AND due_at > ?")
-        params.append(ensure_kst(due_after).isoformat())
+        params["due_after"] = to_epoch_us(due_after)
 
-    query.append("ORDER BY due_at ASC")
+    sql = SQL_FETCH_TASKS[(bool(state), title_filter_mode(q), bool(due_before), bool(due_after))]
+    return conn.execute(sql, params)
 
-    return conn.execute("\n".join(query), params)
 
+def bulk_insert_tasks(conn: sqlite3.Connection, rows: Iterable[tuple[Any, ...]]) -> None:
+    """Insert many ``SQL_INSERT_TASK`` rows in one transaction (seeding, imports)."""
+    with _write_lock:
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(SQL_INSERT_TASK, rows)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
 
-@app.post("/v1/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(payload: CreateTaskRequest, conn: sqlite3.Connection = Depends(get_db)) -> TaskResponse:
-    task_id = str(uuid.uuid4())
-    due_at = ensure_kst(payload.due_at_iso).isoformat()
-    conn.execute(
-        """
-        INSERT INTO tasks (id, title, verify_method, due_at, state)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (task_id, payload.title.strip(), payload.verify_method.strip(), due_at, TaskState.PENDING),
-    )
-    conn.commit()
-    conn.close()
-    return TaskResponse(
-        id=task_id,
-        title=payload.title.strip(),
-        verify_method=payload.verify_method.strip(),
-        due_at_iso=ensure_kst(payload.due_at_iso).isoformat(),
-        state=TaskState.PENDING,
-    )
+
+def insert_task(conn: sqlite3.Connection, row: tuple[Any, ...]) -> None:
+    with _write_lock:
+        conn.execute(SQL_INSERT_TASK, row)
+        conn.commit()
+
+
+def list_task_items(
+    conn: sqlite3.Connection,
+    state: Optional[TaskState],
+    q: Optional[str],
+    due_before: Optional[datetime],
+    due_after: Optional[datetime],
+) -> list[dict[str, Any]]:
+    return rows_to_items(fetch_tasks(conn, state, q, due_before, due_after))
 
 
-@app.get("/v1/tasks", response_model=TaskListResponse)
-def list_tasks(
+def record_verification(
+    conn: sqlite3.Connection,
+    task_key: bytes,
+    attempt: tuple[Any, ...],
+    approve: bool,
+) -> Optional[sqlite3.Row]:
+    # Lookup (or approval) and the attempt log share one write transaction:
+    # one lock acquisition and one commit per call.
+    with _write_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if approve:
+                task = conn.execute(SQL_APPROVE_TASK, (_STATE_APPROVED, task_key)).fetchone()
+            else:
+                task = conn.execute(SQL_SELECT_TASK_BY_ID, {**effective_state_params(), "id": task_key}).fetchone()
+            if not task:
+                conn.rollback()
+                return None
+
+            conn.execute(SQL_INSERT_ATTEMPT, attempt)
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+    return task
+
+
+def encode_raw_features(raw_features: Optional[dict[str, Any]]) -> Optional[str]:
+    if raw_features is None:
+        return None
+    try:
+        return orjson.dumps(raw_features).decode()
+    except orjson.JSONEncodeError:
+        # orjson rejects integers outside 64 bits; the stdlib encoder does not.
+        return json.dumps(raw_features)
+
+
+# Routes run on the event loop; blocking sqlite work is handed to a worker
+# thread, and the connection pool bounds how many run at once.
+@app.post(
+    "/v1/tasks",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": TaskResponse}},
+)
+async def create_task(payload: CreateTaskRequest, conn: sqlite3.Connection = Depends(get_db)) -> dict[str, Any]:
+    task_id = new_id()
+    due_at = to_epoch_us(payload.due_at_iso)
+    row = (task_id, payload.title, payload.verify_method, due_at, _STATE_PENDING)
+    await run_db(insert_task, conn, row)
+    return {
+        "id": id_to_str(task_id),
+        "title": payload.title,
+        "verify_method": payload.verify_method,
+        "due_at_iso": iso_from_epoch_us(due_at),
+        "state": _STATE_PENDING,
+    }
+
+
+@app.get("/v1/tasks", response_model=None, responses={status.HTTP_200_OK: {"model": TaskListResponse}})
+async def list_tasks(
     state: Optional[TaskState] = Query(None),
     q: Optional[str] = Query(None),
     due_before: Optional[datetime] = Query(None),
     due_after: Optional[datetime] = Query(None),
     conn: sqlite3.Connection = Depends(get_db),
-) -> TaskListResponse:
-    expire_overdue_tasks(conn)
-    rows = fetch_tasks(conn, state, q, due_before, due_after)
-    items = [
-        TaskResponse(
-            id=row["id"],
-            title=row["title"],
-            verify_method=row["verify_method"],
-            due_at_iso=ensure_kst(datetime.fromisoformat(row["due_at"])).isoformat(),
-            state=row["state"],
-        )
-        for row in rows
-    ]
-    conn.close()
-    return TaskListResponse(items=items)
-
-
-@app.post("/v1/tasks/{task_id}/verify-attempt", response_model=VerifyAttemptResponse)
-def verify_task(
+) -> dict[str, Any]:
+    items = await run_db(list_task_items, conn, state, q, due_before, due_after)
+    return {"items": items}
+
+
+@app.post(
+    "/v1/tasks/{task_id}/verify-attempt",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": VerifyAttemptResponse}},
+)
+async def verify_task(
     task_id: str,
     payload: VerificationAttemptRequest,
     conn: sqlite3.Connection = Depends(get_db),
-) -> VerifyAttemptResponse:
-    task = conn.execute("SELECT id, state FROM tasks WHERE id = ?", (task_id,)).fetchone()
-    if not task:
-        conn.close()
+) -> dict[str, Any]:
+    task_key = id_from_str(task_id)
+    if task_key is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
-    attempt_id = str(uuid.uuid4())
-    conn.execute(
-        """
-        INSERT INTO verification_attempts (
-            id,
-            task_id,
-            proof_url,
-            verdict,
-            score,
-            reasons,
-            raw_features
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            attempt_id,
-            task_id,
-            payload.proof_url.strip(),
-            int(payload.verdict),
-            payload.score,
-            payload.reasons,
-            json.dumps(payload.raw_features) if payload.raw_features is not None else None,
-        ),
+    raw_features = encode_raw_features(payload.raw_features)
+    attempt = (
+        new_id(),
+        task_key,
+        payload.proof_url,
+        int(payload.verdict),
+        payload.score,
+        payload.reasons,
+        raw_features,
     )
 
-    new_state = task["state"]
-    if payload.verdict:
-        conn.execute(
-            """
-            UPDATE tasks
-            SET state = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            """,
-            (TaskState.APPROVED, task_id),
-        )
-        new_state = TaskState.APPROVED
-
-    conn.commit()
-    conn.close()
-
-    return VerifyAttemptResponse(task_id=task_id, state=new_state)
+    task = await run_db(record_verification, conn, task_key, attempt, payload.verdict)
+    if task is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    return {"task_id": task_id, "state": task["state"]}
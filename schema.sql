@@ -1,18 +1,41 @@
 CREATE TABLE IF NOT EXISTS tasks (
-  id TEXT PRIMARY KEY,
+  id BLOB PRIMARY KEY, -- 16-byte UUID
   title TEXT NOT NULL,
   verify_method TEXT NOT NULL,
-  due_at TIMESTAMP NOT NULL,
+  due_at INTEGER NOT NULL, -- epoch microseconds (UTC)
   state TEXT NOT NULL CHECK (state IN ('PENDING', 'APPROVED', 'EXPIRED')),
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+) WITHOUT ROWID;
 
 CREATE INDEX IF NOT EXISTS idx_tasks_state_due ON tasks (state, due_at);
+-- Covers GET /v1/tasks: ordered by due_at and never touches the table pages.
+CREATE INDEX IF NOT EXISTS idx_tasks_due_covering ON tasks (due_at, state, id, title, verify_method);
+
+-- Trigram index over titles so the list endpoint's substring filter
+-- (title LIKE '%q%') is answered from the index instead of a table scan.
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5 (id UNINDEXED, title, tokenize = 'trigram');
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+  INSERT INTO tasks_fts (id, title) VALUES (new.id, new.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title ON tasks BEGIN
+  UPDATE tasks_fts SET title = new.title WHERE id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+  DELETE FROM tasks_fts WHERE id = old.id;
+END;
+
+-- Backfill databases created before tasks_fts existed.
+INSERT INTO tasks_fts (id, title)
+SELECT id, title FROM tasks
+WHERE NOT EXISTS (SELECT 1 FROM tasks_fts);
 
 CREATE TABLE IF NOT EXISTS verification_attempts (
-  id TEXT PRIMARY KEY,
-  task_id TEXT NOT NULL,
+  id BLOB PRIMARY KEY, -- 16-byte UUID
+  task_id BLOB NOT NULL,
   attempted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   proof_url TEXT NOT NULL,
   verdict INTEGER NOT NULL CHECK (verdict IN (0, 1)),